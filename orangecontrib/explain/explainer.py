@@ -129,9 +129,11 @@ def _explain_other_models(
     transformed_data: Table,
     transformed_reference_data: Table,
     progress_callback: Callable,
+    n_samples: int = 100,
 ) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray]:
     """
-    Computes SHAP values for any learner with KernelExplainer.
+    Computes SHAP values for any learner with KernelExplainer. n_samples is
+    the number of times the model is evaluated when explaining each instance.
     """
     # 1000 is a number that for normal data and model do not take so long
     data_sample, sample_mask = _subsample_data(transformed_data, 1000)
@@ -157,7 +159,8 @@ def _explain_other_models(
         progress_callback(i / len(data_sample))
         shap_values.append(
             explainer.shap_values(
-                row, nsamples=100, silent=True, l1_reg="num_features(90)"
+                row, nsamples=n_samples, silent=True,
+                l1_reg="num_features(90)"
             )
         )
     return (
@@ -172,6 +175,7 @@ def compute_shap_values(
     data: Table,
     reference_data: Table,
     progress_callback: Callable = None,
+    n_samples: int = 100,
 ) -> Tuple[List[np.ndarray], Table, np.ndarray, np.ndarray]:
     """
     Compute SHAP values - explanation for a model. And also give a transformed
@@ -187,6 +191,9 @@ def compute_shap_values(
         Background data for perturbation purposes
     progress_callback
         The callback for reporting the progress.
+    n_samples
+        The number of model evaluations used to explain each instance when
+        the model cannot be explained with TreeExplainer.
 
     Returns
     -------
@@ -226,6 +233,7 @@ def compute_shap_values(
                 data_transformed,
                 reference_data_transformed,
                 progress_callback,
+                n_samples,
             )
 
         # for regression return array with one value
@@ -381,6 +389,7 @@ def explain_predictions(
     data: Table,
     background_data: Table,
     progress_callback: Callable = None,
+    n_samples: int = 100,
 ) -> Tuple[List[np.ndarray], np.ndarray, Table, np.ndarray, np.ndarray]:
     """
     Compute SHAP values and predictions for each item in data.
@@ -398,6 +407,9 @@ def explain_predictions(
         SHAP used them in the perturbation process.
     progress_callback
         Callback to report progress.
+    n_samples
+        The number of model evaluations used to explain each instance when
+        the model cannot be explained with TreeExplainer.
 
     Returns
     -------
@@ -439,7 +451,8 @@ def explain_predictions(
         predictions = predictions[:, None]
 
     shap_values, transformed_data, sample_mask, base_value = \
-        compute_shap_values(model, data, background_data, progress_callback)
+        compute_shap_values(model, data, background_data, progress_callback,
+                            n_samples)
     return shap_values, predictions, transformed_data, sample_mask, base_value
 
 
@@ -1,7 +1,9 @@
 import inspect
 import unittest
+from unittest.mock import patch
 
 import numpy as np
+from shap import KernelExplainer
 
 from Orange.classification import (
     LogisticRegressionLearner,
@@ -91,6 +93,19 @@ class TestExplainer(unittest.TestCase):
         self.assertTupleEqual(shap_values[1].shape, (1, 4))
         self.assertTupleEqual(shap_values[2].shape, (1, 4))
 
+    def test_kernel_explainer_n_samples(self):
+        model = LogisticRegressionLearner()(self.iris)
+
+        with patch.object(KernelExplainer, "shap_values",
+                          autospec=True,
+                          side_effect=KernelExplainer.shap_values) as mock:
+            shap_values, _, _, _ = compute_shap_values(
+                model, self.iris[:5], self.iris, n_samples=20
+            )
+        self.assertEqual(mock.call_count, 5)
+        self.assertEqual(mock.call_args[1]["nsamples"], 20)
+        self.assertTupleEqual(shap_values[0].shape, (5, 4))
+
     def test_kernel_explainer_sgd(self):
         learner = SGDClassificationLearner()
         model = learner(self.titanic)
@@ -46,8 +46,8 @@ class RunnerResults(SimpleNamespace):
     base_value: Optional[float] = None
 
 
-def run(data: Table, background_data: Table, model: Model, state: TaskState) \
-        -> Optional[RunnerResults]:
+def run(data: Table, background_data: Table, model: Model, n_samples: int,
+        state: TaskState) -> Optional[RunnerResults]:
     if not data or not background_data or not model:
         return None
 
@@ -59,7 +59,7 @@ def run(data: Table, background_data: Table, model: Model, state: TaskState) \
             raise Exception
 
     values, pred, data, sample_mask, base_value = explain_predictions(
-        model, data, background_data, callback)
+        model, data, background_data, callback, n_samples)
     return RunnerResults(values=values,
                          predictions=pred,
                          transformed_data=data,
@@ -549,6 +549,8 @@ class OWExplainPredictions(OWWidget, ConcurrentWidgetMixin):
     graph_name = "graph.plotItem"
 
     ANNOTATIONS = ["None", "Enumeration"]
+    # the number of model evaluations per instance for KernelExplainer
+    _DEFAULT_N_SAMPLES = 100
 
     def __init__(self):
         OWWidget.__init__(self)
@@ -716,7 +718,8 @@ class OWExplainPredictions(OWWidget, ConcurrentWidgetMixin):
 
     def handleNewSignals(self):
         self.clear()
-        self.start(run, self.data, self.background_data, self.model)
+        self.start(run, self.data, self.background_data, self.model,
+                   self._DEFAULT_N_SAMPLES)
         self.commit()
 
     def clear(self):
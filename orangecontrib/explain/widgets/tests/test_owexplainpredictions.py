@@ -1,4 +1,5 @@
 # pylint: disable=missing-docstring
+import os
 import unittest
 from typing import Type
 from unittest.mock import Mock, patch
@@ -7,16 +8,19 @@ import numpy as np
 from AnyQt.QtCore import QPointF, Qt
 from AnyQt.QtGui import QFont
 from AnyQt.QtWidgets import QToolTip
+from parameterized import parameterized
 
-from Orange.base import Learner
+from Orange.base import Learner, Model
 from Orange.classification import RandomForestLearner, CalibratedLearner, \
-    ThresholdLearner
+    ThresholdLearner, LogisticRegressionLearner
 from Orange.data import Table
-from Orange.regression import RandomForestRegressionLearner
+from Orange.regression import RandomForestRegressionLearner, \
+    LinearRegressionLearner
 from Orange.tests.test_classification import all_learners as all_cls_learners
 from Orange.tests.test_regression import all_learners as all_reg_learners
 from Orange.widgets.tests.utils import simulate
-from orangecontrib.explain.explainer import INSTANCE_ORDERINGS
+from orangecontrib.explain.explainer import INSTANCE_ORDERINGS, \
+    explain_predictions
 from orangecontrib.explain.widgets.owexplainpredictions import ForcePlot, \
     OWExplainPredictions
 from orangewidget.tests.base import WidgetTest
@@ -43,11 +47,49 @@ def init_learner(learner: Type[Learner], table: Table) -> Learner:
     return init_reg_learner(learner, table)
 
 
+# the widget does not depend on the type of the learner, so representative
+# learners suffice by default; set EXPLAIN_FULL_LEARNER_MATRIX to test all
+if os.environ.get("EXPLAIN_FULL_LEARNER_MATRIX"):
+    REG_LEARNERS = list(all_reg_learners())
+    CLS_LEARNERS = list(all_cls_learners())
+else:
+    REG_LEARNERS = [RandomForestRegressionLearner, LinearRegressionLearner]
+    CLS_LEARNERS = [RandomForestLearner, LogisticRegressionLearner,
+                    CalibratedLearner]
+
+_HOUSING = Table("housing")
+_HEART = Table("heart_disease")
+
+_EXPLAIN_PREDICTIONS = \
+    "orangecontrib.explain.widgets.owexplainpredictions.explain_predictions"
+_explanations = {}
+
+
+def cached_explain_predictions(model, data, background_data,
+                               progress_callback, n_samples):
+    """
+    Compute explanations only once for each model and data combination.
+    Used in tests that do not test the explanation itself.
+    """
+    key = (model, data.checksum(), background_data.checksum(), n_samples)
+    if key not in _explanations:
+        _explanations[key] = explain_predictions(
+            model, data, background_data, progress_callback, n_samples)
+    return _explanations[key]
+
+
+_X5 = np.arange(5)
+_POS5 = [(_X5 - 1, _X5)]
+_NEG5 = [(_X5, _X5 + 1)]
+for _arr in (_X5, *_POS5[0], *_NEG5[0]):
+    _arr.setflags(write=False)
+
+
 class TestForcePlot(WidgetTest):
     def setUp(self):
         widget = self.create_widget(OWExplainPredictions)
         self.plot = ForcePlot(widget)
-        self.housing = Table("housing")
+        self.housing = _HOUSING
 
     def test_zoom_select(self):
         self.plot.select_button_clicked()
@@ -71,11 +113,8 @@ class TestForcePlot(WidgetTest):
         view_box.mouseDragEvent(event)
 
         # set data
-        x_data = np.arange(5)
-        pos_y_data = [(np.arange(5) - 1, np.arange(5))]
-        neg_y_data = [(np.arange(5), np.arange(5) + 1)]
         labels = [a.name for a in self.housing.domain.attributes]
-        self.plot.set_data(x_data, pos_y_data, neg_y_data, "", "",
+        self.plot.set_data(_X5, _POS5, _NEG5, "", "",
                            labels, labels, self.housing)
 
         # select after data is sent
@@ -102,19 +141,47 @@ class TestOWExplainPredictions(WidgetTest):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        cls.heart = Table("heart_disease")
-        cls.housing = Table("housing")
+        cls.heart = _HEART
+        cls.housing = _HOUSING
+        cls.heart1 = cls.heart[:1]
+        cls.heart5 = cls.heart[:5]
+        cls.heart10 = cls.heart[:10]
+        cls.housing5 = cls.housing[:5]
+        cls.housing10 = cls.housing[:10]
         kwargs = {"random_state": 0}
         cls.rf_cls = RandomForestLearner(**kwargs)(cls.heart)
         cls.rf_reg = RandomForestRegressionLearner(**kwargs)(cls.housing)
 
+        cls.heart_sample = cls.heart[::4]
+        cls.housing_sample = cls.housing[::4]
+
+        # fewer model evaluations suffice for testing the widget
+        cls._n_samples_patch = patch.object(
+            OWExplainPredictions, "_DEFAULT_N_SAMPLES", 64)
+        cls._n_samples_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._n_samples_patch.stop()
+        _explanations.clear()
+        super().tearDownClass()
+
+    def fit_model(self, learner: Type[Learner], data: Table) -> Model:
+        # random forests are not refitted on the sample; the models fitted
+        # on the whole data are sent with the sample instead
+        fitted = {RandomForestLearner: self.rf_cls,
+                  RandomForestRegressionLearner: self.rf_reg}
+        if learner in fitted:
+            return fitted[learner]
+        return init_learner(learner, data)(data)
+
     def setUp(self):
         self.widget = self.create_widget(OWExplainPredictions)
 
     def test_input_one_instance(self):
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.data, self.heart[:1])
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.data, self.heart1),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
 
         self.assertTrue(self.widget.Error.not_enough_data.is_shown())
@@ -124,9 +191,9 @@ class TestOWExplainPredictions(WidgetTest):
     def test_input_too_many_instances(self):
         titanic = Table("titanic")
         model = RandomForestLearner(random_state=0)(titanic)
-        self.send_signal(self.widget.Inputs.background_data, titanic)
-        self.send_signal(self.widget.Inputs.data, titanic)
-        self.send_signal(self.widget.Inputs.model, model)
+        self.send_signals([(self.widget.Inputs.background_data, titanic),
+                           (self.widget.Inputs.data, titanic),
+                           (self.widget.Inputs.model, model)])
         self.wait_until_finished()
         self.assertTrue(self.widget.Information.data_sampled.is_shown())
 
@@ -137,31 +204,31 @@ class TestOWExplainPredictions(WidgetTest):
         self.assertFalse(self.widget.Information.data_sampled.is_shown())
 
     def test_classification_data_classification_model(self):
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
         self.assertPlotNotEmpty(self.widget.graph)
 
     def test_classification_data_regression_model(self):
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.model, self.rf_reg)
+        self.send_signals([(self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.model, self.rf_reg)])
         self.wait_until_finished()
         self.assertPlotEmpty(self.widget.graph)
         self.assertTrue(self.widget.Error.domain_transform_err.is_shown())
 
     def test_regression_data_regression_model(self):
-        self.send_signal(self.widget.Inputs.background_data, self.housing)
-        self.send_signal(self.widget.Inputs.data, self.housing[:10])
-        self.send_signal(self.widget.Inputs.model, self.rf_reg)
+        self.send_signals([(self.widget.Inputs.background_data, self.housing),
+                           (self.widget.Inputs.data, self.housing10),
+                           (self.widget.Inputs.model, self.rf_reg)])
         self.wait_until_finished()
         self.assertPlotNotEmpty(self.widget.graph)
 
     def test_regression_data_classification_model(self):
-        self.send_signal(self.widget.Inputs.background_data, self.housing)
-        self.send_signal(self.widget.Inputs.data, self.housing[:10])
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.background_data, self.housing),
+                           (self.widget.Inputs.data, self.housing10),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
         self.assertPlotEmpty(self.widget.graph)
         self.assertTrue(self.widget.Error.domain_transform_err.is_shown())
@@ -170,19 +237,19 @@ class TestOWExplainPredictions(WidgetTest):
         self.assertEqual(self.widget._target_combo.currentText(), "")
         self.assertTrue(self.widget._target_combo.isEnabled())
 
-        self.send_signal(self.widget.Inputs.data, self.heart[:5])
+        self.send_signal(self.widget.Inputs.data, self.heart5)
         self.assertEqual(self.widget._target_combo.currentText(), "0")
         self.assertTrue(self.widget._target_combo.isEnabled())
 
-        self.send_signal(self.widget.Inputs.data, self.housing[:5])
+        self.send_signal(self.widget.Inputs.data, self.housing5)
         self.assertEqual(self.widget._target_combo.currentText(), "")
         self.assertFalse(self.widget._target_combo.isEnabled())
 
-        self.send_signal(self.widget.Inputs.data, self.heart[:5])
+        self.send_signal(self.widget.Inputs.data, self.heart5)
         self.assertEqual(self.widget._target_combo.currentText(), "0")
         self.assertTrue(self.widget._target_combo.isEnabled())
 
-        self.send_signal(self.widget.Inputs.data, self.housing[:5])
+        self.send_signal(self.widget.Inputs.data, self.housing5)
         self.assertEqual(self.widget._target_combo.currentText(), "")
         self.assertFalse(self.widget._target_combo.isEnabled())
 
@@ -199,7 +266,7 @@ class TestOWExplainPredictions(WidgetTest):
         self.assertEqual(self.widget._order_combo.currentText(),
                          "Order instances by similarity")
         self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
+        self.send_signal(self.widget.Inputs.data, self.heart10)
         # 2 separators
         self.assertEqual(self.widget._order_combo.count(),
                          len(self.heart.domain) + 2 + len(INSTANCE_ORDERINGS))
@@ -211,6 +278,7 @@ class TestOWExplainPredictions(WidgetTest):
                          "Order instances by similarity")
         self.assertEqual(self.widget._order_combo.count(), 3)
 
+    @patch(_EXPLAIN_PREDICTIONS, cached_explain_predictions)
     def test_annotation_combo(self):
         self.assertEqual(self.widget._annot_combo.currentText(), "None")
         self.assertEqual(self.widget._annot_combo.count(), 2)
@@ -219,9 +287,9 @@ class TestOWExplainPredictions(WidgetTest):
         self.assertEqual(self.widget._annot_combo.currentText(), "None")
         self.assertEqual(self.widget._annot_combo.count(), 2)
 
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.data, self.heart[:5])
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.data, self.heart5),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.assertEqual(self.widget._annot_combo.currentText(), "None")
         self.assertEqual(self.widget._annot_combo.count(), 18)
         self.wait_until_finished()
@@ -240,13 +308,14 @@ class TestOWExplainPredictions(WidgetTest):
         self.assertEqual(self.widget._annot_combo.currentText(), "None")
         self.assertEqual(self.widget._annot_combo.count(), 2)
 
+    @patch(_EXPLAIN_PREDICTIONS, cached_explain_predictions)
     def test_setup_plot(self):
         self.widget.graph.set_data = Mock()
         self.widget.graph.set_axis = Mock()
 
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.data, self.heart[:5])
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.data, self.heart5),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
         self.widget.graph.set_axis.assert_called()
 
@@ -272,28 +341,23 @@ class TestOWExplainPredictions(WidgetTest):
         self.wait_until_finished()
         self.assertPlotNotEmpty(self.widget.graph)
 
-        self.send_signal(self.widget.Inputs.model, None)
-        self.assertPlotEmpty(self.widget.graph)
-
-        self.send_signal(self.widget.Inputs.model, self.rf_reg)
-        self.wait_until_finished()
+        self.send_signal(self.widget.Inputs.data, None)
         self.assertPlotEmpty(self.widget.graph)
 
         self.send_signal(self.widget.Inputs.data, self.heart)
         self.wait_until_finished()
+        self.send_signal(self.widget.Inputs.model, None)
         self.assertPlotEmpty(self.widget.graph)
 
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signal(self.widget.Inputs.model, self.rf_reg)
         self.wait_until_finished()
-        self.assertPlotNotEmpty(self.widget.graph)
-
-        self.send_signal(self.widget.Inputs.data, None)
         self.assertPlotEmpty(self.widget.graph)
 
+    @patch(_EXPLAIN_PREDICTIONS, cached_explain_predictions)
     def test_plot_multiple_selection(self):
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
 
         event = Mock()
@@ -313,23 +377,27 @@ class TestOWExplainPredictions(WidgetTest):
         output = self.get_output(self.widget.Outputs.selected_data)
         self.assertEqual(len(output), 5)
 
-    def test_all_models(self):
-        def run(data):
-            self.send_signal(self.widget.Inputs.background_data, data)
-            self.send_signal(self.widget.Inputs.data, data)
-            model = init_learner(learner, data)(data)
-            self.send_signal(self.widget.Inputs.model, model)
-            self.wait_until_finished(timeout=50000)
+    def _run_model(self, learner: Type[Learner], data: Table):
+        model = self.fit_model(learner, data)
+        self.send_signals([(self.widget.Inputs.background_data, data),
+                           (self.widget.Inputs.data, data),
+                           (self.widget.Inputs.model, model)])
+        self.wait_until_finished(timeout=50000)
+
+    @parameterized.expand([(learner.__name__, learner)
+                           for learner in REG_LEARNERS])
+    def test_all_regression_models(self, _, learner: Type[Learner]):
+        self._run_model(learner, self.housing_sample)
 
-        for learner in all_reg_learners():
-            run(self.housing[::4])
-        for learner in all_cls_learners():
-            run(self.heart[::4])
+    @parameterized.expand([(learner.__name__, learner)
+                           for learner in CLS_LEARNERS])
+    def test_all_classification_models(self, _, learner: Type[Learner]):
+        self._run_model(learner, self.heart_sample)
 
     def test_output_scores(self):
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
 
         output = self.get_output(self.widget.Outputs.scores)
@@ -342,9 +410,9 @@ class TestOWExplainPredictions(WidgetTest):
         self.assertIsNone(self.get_output(self.widget.Outputs.scores))
 
     def test_output_selection(self):
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
 
         event = Mock()
@@ -362,9 +430,9 @@ class TestOWExplainPredictions(WidgetTest):
         self.assertIsNone(self.get_output(self.widget.Outputs.selected_data))
 
     def test_output_data(self):
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
 
         output = self.get_output(self.widget.Outputs.annotated_data)
@@ -382,18 +450,19 @@ class TestOWExplainPredictions(WidgetTest):
         self.send_signal(self.widget.Inputs.data, None)
         self.assertIsNone(self.get_output(self.widget.Outputs.annotated_data))
 
+    @patch(_EXPLAIN_PREDICTIONS, cached_explain_predictions)
     def test_settings(self):
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.model, self.rf_cls)])
 
         simulate.combobox_activate_index(self.widget._target_combo, 1)
         simulate.combobox_activate_index(self.widget._order_combo, 4)
         simulate.combobox_activate_index(self.widget._annot_combo, 3)
 
-        self.send_signal(self.widget.Inputs.data, self.housing[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.housing)
-        self.send_signal(self.widget.Inputs.model, self.rf_reg)
+        self.send_signals([(self.widget.Inputs.data, self.housing10),
+                           (self.widget.Inputs.background_data, self.housing),
+                           (self.widget.Inputs.model, self.rf_reg)])
 
         self.assertEqual(self.widget.target_index, -1)
         self.assertEqual(self.widget.order_index, 0)
@@ -402,20 +471,21 @@ class TestOWExplainPredictions(WidgetTest):
         simulate.combobox_activate_index(self.widget._order_combo, 6)
         simulate.combobox_activate_index(self.widget._annot_combo, 7)
 
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
+        self.send_signal(self.widget.Inputs.data, self.heart10)
         self.assertEqual(self.widget.target_index, 1)
         self.assertEqual(self.widget.order_index, 4)
         self.assertEqual(self.widget.annot_index, 3)
 
-        self.send_signal(self.widget.Inputs.data, self.housing[:10])
+        self.send_signal(self.widget.Inputs.data, self.housing10)
         self.assertEqual(self.widget.target_index, -1)
         self.assertEqual(self.widget.order_index, 6)
         self.assertEqual(self.widget.annot_index, 7)
 
+    @patch(_EXPLAIN_PREDICTIONS, cached_explain_predictions)
     def test_saved_selection(self):
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.wait_until_finished()
 
         event = Mock()
@@ -434,11 +504,12 @@ class TestOWExplainPredictions(WidgetTest):
 
         settings = self.widget.settingsHandler.pack_data(self.widget)
 
+        # explanations are cached, so only the selection is restored anew
         w = self.create_widget(OWExplainPredictions, stored_settings=settings)
-        self.send_signal(w.Inputs.data, self.heart[:10], widget=w)
-        self.send_signal(w.Inputs.background_data, self.heart, widget=w)
-        self.send_signal(w.Inputs.model, self.rf_cls, widget=w)
-        self.wait_until_finished()
+        self.send_signals([(w.Inputs.data, self.heart10),
+                           (w.Inputs.background_data, self.heart),
+                           (w.Inputs.model, self.rf_cls)], widget=w)
+        self.wait_until_finished(w)
 
         output = self.get_output(w.Outputs.selected_data, widget=w)
         self.assertEqual(len(output), 5)
@@ -455,9 +526,9 @@ class TestOWExplainPredictions(WidgetTest):
             bottom_axis = setter.master.getAxis("bottom")
             self.assertFalse(bottom_axis.style["rotateTicks"])
 
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.model, self.rf_cls)])
         key, value = ("Fonts", "Font family", "Font family"), "Helvetica"
         self.widget.set_visual_settings(key, value)
 
@@ -471,22 +542,22 @@ class TestOWExplainPredictions(WidgetTest):
 
         test_settings()
 
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
+        self.send_signal(self.widget.Inputs.data, self.heart10)
         test_settings()
 
         self.send_signal(self.widget.Inputs.data, None)
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
+        self.send_signal(self.widget.Inputs.data, self.heart10)
         test_settings()
 
     def test_send_report(self):
         self.widget.send_report()
-        self.send_signal(self.widget.Inputs.data, self.heart[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.heart)
-        self.send_signal(self.widget.Inputs.model, self.rf_cls)
+        self.send_signals([(self.widget.Inputs.data, self.heart10),
+                           (self.widget.Inputs.background_data, self.heart),
+                           (self.widget.Inputs.model, self.rf_cls)])
         self.widget.send_report()
-        self.send_signal(self.widget.Inputs.data, self.housing[:10])
-        self.send_signal(self.widget.Inputs.background_data, self.housing)
-        self.send_signal(self.widget.Inputs.model, self.rf_reg)
+        self.send_signals([(self.widget.Inputs.data, self.housing10),
+                           (self.widget.Inputs.background_data, self.housing),
+                           (self.widget.Inputs.model, self.rf_reg)])
         self.widget.send_report()
 
     def assertPlotNotEmpty(self, plot: ForcePlot):
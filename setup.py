@@ -49,7 +49,7 @@ INSTALL_REQUIRES = [
 ]
 
 EXTRAS_REQUIRE = {
-    'test': ['pytest', 'coverage'],
+    'test': ['pytest', 'coverage', 'parameterized'],
     'doc': ['sphinx', 'recommonmark', 'sphinx_rtd_theme'],
 }
 